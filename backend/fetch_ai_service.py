@@ -2,40 +2,126 @@
 Fetch AI service for generating vocal analysis reports
 """
 import os
+import re
+import sys
+import math
+import time
 import logging
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
 import asyncio
+from contextlib import AsyncExitStack
+from functools import lru_cache
 from dataclasses import dataclass
-import json
-import statistics
+from itertools import groupby
 from enum import Enum
-import requests
+import aiohttp
+import numpy as np
+import orjson
 
 # Supabase client for database access
 from supabase import create_client, Client
 
+# Fast C parser for Supabase timestamps when available
+try:
+    from ciso8601 import parse_datetime as _parse_ts
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # fromisoformat accepts the trailing 'Z' natively from 3.11
+        _parse_ts = datetime.fromisoformat
+    else:
+        def _parse_ts(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 logger = logging.getLogger(__name__)
 
+# Metrics for the current day can still change; past days are cached indefinitely
+TODAY_METRICS_CACHE_TTL = 60
+METRICS_CACHE_MAX_ENTRIES = 4096
+
+# Only the vocal_analysis_history columns the aggregation reads (covered by
+# idx_vocal_analysis_history_user_created)
+_SESSION_COLUMNS = 'created_at,mean_pitch,vibrato_rate,jitter,shimmer,dynamics,voice_type,lowest_note,highest_note'
+
+# Note name -> frequency lookup (A4 = 440 Hz) for every note C0..B9
+_NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+_NOTE_FREQ: Dict[str, float] = {
+    f"{name}{octave}": 440 * (2 ** ((index - 9) / 12 + (octave - 4)))
+    for octave in range(10)
+    for index, name in enumerate(_NOTE_NAMES)
+}
+
+# Limits for finishing an ASI-1 stream in the background once its JSON is complete;
+# past either limit the connection is closed instead of returned to the pool
+AI_STREAM_DRAIN_TIMEOUT = 5
+AI_STREAM_DRAIN_MAX_BYTES = 64 * 1024
+
+# Above this many notes, frequencies are looked up once per distinct note
+NOTE_BATCH_THRESHOLD = 64
+
+# Line matchers for free-text ASI-1 responses that are not valid JSON
+_INSIGHT_RE = re.compile(r'(?i)(insight|improved)')
+_RECOMMENDATION_RE = re.compile(r'(?i)(recommend|try)')
+
 class TrendDirection(Enum):
     UP = "up"
     DOWN = "down"
     STABLE = "baseline"
 
-@dataclass
-class SessionMetrics:
-    """Data class for a single session's metrics"""
-    timestamp: datetime
-    mean_pitch: float
-    vibrato_rate: float
-    jitter: float
-    shimmer: float
-    dynamics: str
-    voice_type: str
-    lowest_note: str
-    highest_note: str
+@dataclass(slots=True)
+class SessionColumns:
+    """Column-oriented metrics for all sessions of a single day"""
+    pitch: np.ndarray
+    vibrato: np.ndarray
+    jitter: np.ndarray
+    shimmer: np.ndarray
+    dynamics: np.ndarray
+    voice_type: np.ndarray
+    lowest: np.ndarray
+    highest: np.ndarray
+    timestamps: np.ndarray  # epoch seconds
+
+    def __len__(self) -> int:
+        return len(self.pitch)
 
-@dataclass
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "SessionColumns":
+        """Build columns from vocal_analysis_history rows in a single pass"""
+        count = len(rows)
+        pitch = np.empty(count)
+        vibrato = np.empty(count)
+        jitter = np.empty(count)
+        shimmer = np.empty(count)
+        timestamps = np.empty(count)
+        dynamics = []
+        voice_type = []
+        lowest = []
+        highest = []
+        
+        for i, row in enumerate(rows):
+            pitch[i] = row.get('mean_pitch') or 0
+            vibrato[i] = row.get('vibrato_rate') or 0
+            jitter[i] = row.get('jitter') or 0
+            shimmer[i] = row.get('shimmer') or 0
+            timestamps[i] = _parse_ts(row['created_at']).timestamp()
+            dynamics.append(row.get('dynamics') or 'stable')
+            voice_type.append(row.get('voice_type') or 'unknown')
+            lowest.append(row.get('lowest_note') or 'C3')
+            highest.append(row.get('highest_note') or 'C5')
+        
+        return cls(
+            pitch=pitch,
+            vibrato=vibrato,
+            jitter=jitter,
+            shimmer=shimmer,
+            dynamics=np.array(dynamics),
+            voice_type=np.array(voice_type),
+            lowest=np.array(lowest),
+            highest=np.array(highest),
+            timestamps=timestamps
+        )
+
+@dataclass(slots=True)
 class DailyMetrics:
     """Data class for aggregated daily metrics"""
     date: str
@@ -51,7 +137,7 @@ class DailyMetrics:
     pitch_stability: float  # standard deviation of mean_pitch
     practice_consistency: float  # time spread of sessions
 
-@dataclass
+@dataclass(slots=True)
 class MetricComparison:
     """Data class for metric comparison"""
     current: float
@@ -60,7 +146,7 @@ class MetricComparison:
     trend: str  # 'up', 'down', 'baseline'
     improvement_percentage: Optional[float]
 
-@dataclass
+@dataclass(slots=True)
 class FetchAiReport:
     """Data class for Fetch AI report"""
     date: str
@@ -73,6 +159,65 @@ class FetchAiReport:
     total_practice_time: float  # in minutes
     best_time_of_day: str
 
+def _iter_days(start_date: str, end_date: str) -> List[str]:
+    """List every YYYY-MM-DD date between two days (inclusive)"""
+    day = datetime.strptime(start_date, "%Y-%m-%d")
+    last_day = datetime.strptime(end_date, "%Y-%m-%d")
+    days = []
+    while day <= last_day:
+        days.append(day.strftime("%Y-%m-%d"))
+        day += timedelta(days=1)
+    return days
+
+def _calculate_improvement(current: float, previous: float) -> Tuple[float, str]:
+    """Calculate improvement percentage and trend"""
+    if previous == 0:
+        return (0, TrendDirection.STABLE.value)
+        
+    change_pct = ((current - previous) / previous) * 100
+    if abs(change_pct) < 1:
+        return (change_pct, TrendDirection.STABLE.value)
+    return (change_pct, TrendDirection.UP.value if change_pct > 0 else TrendDirection.DOWN.value)
+
+def _note_to_frequency(note: str) -> float:
+    """Convert note name to frequency"""
+    return _NOTE_FREQ.get(note, 0.0)
+
+def _notes_to_frequencies(notes: np.ndarray) -> np.ndarray:
+    """Convert an array of note names to frequencies"""
+    if len(notes) <= NOTE_BATCH_THRESHOLD:
+        return np.fromiter(map(_note_to_frequency, notes), dtype=float, count=len(notes))
+    
+    # Large batches repeat the same few notes: look up each distinct note once
+    unique_notes, inverse = np.unique(notes, return_inverse=True)
+    unique_freqs = np.fromiter(map(_note_to_frequency, unique_notes), dtype=float, count=len(unique_notes))
+    return unique_freqs[inverse]
+
+def _extract_json_object(content: str) -> Optional[Dict[str, Any]]:
+    """Parse the outermost JSON object in model output, or None if incomplete/invalid"""
+    start = content.find('{')
+    end = content.rfind('}')
+    if start == -1 or end < start:
+        return None
+    try:
+        data = orjson.loads(content[start:end + 1])
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+@lru_cache(maxsize=256)
+def _summary(current_sessions: int, previous_sessions: Optional[int]) -> str:
+    """Summary text for a day's session count compared to the previous day"""
+    if previous_sessions is not None:
+        if current_sessions > previous_sessions:
+            return f"Excellent progress today! You completed {current_sessions} practice sessions, showing increased dedication to your vocal development."
+        elif current_sessions == previous_sessions:
+            return f"Consistent practice maintained with {current_sessions} sessions today. Your vocal technique continues to develop steadily."
+        else:
+            return f"Completed {current_sessions} practice sessions today. Consider increasing practice frequency for optimal progress."
+    else:
+        return f"Great start! You completed {current_sessions} practice sessions today. Keep up the momentum!"
+
 class FetchAiVocalCoach:
     """Fetch AI vocal coaching service with ASI-1 integration"""
     
@@ -98,6 +243,45 @@ class FetchAiVocalCoach:
         else:
             self.use_ai = True
             logger.info("ASI-1 API initialized successfully")
+        
+        # Shared HTTP session for ASI-1 calls (created lazily on the running loop)
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._http_lock = asyncio.Lock()
+        self._drain_tasks: Set[asyncio.Task] = set()
+        
+        # Use the daily_vocal_metrics RPC until PostgREST reports it missing
+        self._use_metrics_rpc = True
+        
+        # Per-day metrics cache keyed by (user_id, date) -> (expires_at, metrics)
+        self._metrics_cache: Dict[Tuple[str, str], Tuple[float, Optional[DailyMetrics]]] = {}
+        self._metrics_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        # In-flight report generations keyed by (user_id, date)
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+    
+    async def _get_http(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use"""
+        async with self._http_lock:
+            if self._http is None or self._http.closed:
+                # Keep-alive connections are reused across reports to skip repeated TLS handshakes
+                self._http = aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=30),
+                    connector=aiohttp.TCPConnector(limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=75)
+                )
+            return self._http
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        for task in list(self._drain_tasks):
+            task.cancel()
+        await asyncio.gather(*self._drain_tasks, return_exceptions=True)
+        
+        async with self._http_lock:
+            if self._http is not None and not self._http.closed:
+                await self._http.close()
+            self._http = None
     
     async def _get_ai_insights(self, metrics_data: str, user_context: str) -> Tuple[List[str], List[str]]:
         """Get AI-powered insights using Fetch AI's ASI-1"""
@@ -136,7 +320,7 @@ class FetchAiVocalCoach:
             
             headers = {
                 'Content-Type': 'application/json',
-                'Accept': 'application/json',
+                'Accept': 'text/event-stream',
                 'Authorization': f'bearer {self.asi1_api_key}'
             }
             
@@ -149,36 +333,111 @@ class FetchAiVocalCoach:
                     }
                 ],
                 "temperature": 0.7,
-                "stream": False,
+                "stream": True,
                 "max_tokens": 500
             }
             
-            response = requests.post(self.asi1_url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                content = result["choices"][0]["message"]["content"]
+            session = await self._get_http()
+            response = await session.post(self.asi1_url, headers=headers, data=orjson.dumps(payload))
+            try:
+                if response.status != 200:
+                    logger.error(f"ASI-1 API error: {response.status}")
+                    return self._get_fallback_insights()
                 
-                # Try to parse JSON response
-                try:
-                    ai_data = json.loads(content)
-                    insights = ai_data.get("insights", [])
-                    recommendations = ai_data.get("recommendations", [])
-                    return insights, recommendations
-                except json.JSONDecodeError:
-                    # Fallback: extract insights from text
-                    lines = content.split('\n')
-                    insights = [line for line in lines if 'insight' in line.lower() or 'improved' in line.lower()]
-                    recommendations = [line for line in lines if 'recommend' in line.lower() or 'try' in line.lower()]
-                    return insights[:3], recommendations[:3]
+                if response.content_type == 'text/event-stream':
+                    content = await self._read_ai_stream(response)
+                else:
+                    # Server ignored streaming: parse the full response
+                    result = orjson.loads(await response.read())
+                    content = result["choices"][0]["message"]["content"]
+            finally:
+                if response.content.at_eof():
+                    response.release()
+                else:
+                    # Finish reading off the request path so the keep-alive connection is reused
+                    task = asyncio.create_task(self._drain_response(response))
+                    self._drain_tasks.add(task)
+                    task.add_done_callback(self._drain_tasks.discard)
+            
+            # Try to parse JSON response
+            ai_data = _extract_json_object(content)
+            if ai_data is not None:
+                insights = ai_data.get("insights", [])
+                recommendations = ai_data.get("recommendations", [])
+                return insights, recommendations
             else:
-                logger.error(f"ASI-1 API error: {response.status_code}")
-                return self._get_fallback_insights()
+                # Fallback: extract insights from text
+                insights = []
+                recommendations = []
+                for line in content.splitlines():
+                    if len(insights) < 3 and _INSIGHT_RE.search(line):
+                        insights.append(line)
+                    if len(recommendations) < 3 and _RECOMMENDATION_RE.search(line):
+                        recommendations.append(line)
+                    if len(insights) == 3 and len(recommendations) == 3:
+                        break
+                return insights, recommendations
                 
         except Exception as e:
             logger.error(f"Error getting AI insights: {str(e)}")
             return self._get_fallback_insights()
     
+    async def _read_ai_stream(self, response: aiohttp.ClientResponse) -> str:
+        """Accumulate streamed ASI-1 content, stopping once both JSON arrays have arrived"""
+        parts = []
+        async for raw_line in response.content:
+            line = raw_line.strip()
+            if not line.startswith(b'data:'):
+                continue
+            data = line[5:].strip()
+            if data == b'[DONE]':
+                break
+            
+            try:
+                event = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                continue
+            if not isinstance(event, dict):
+                continue
+            
+            choices = event.get("choices")
+            choice = choices[0] if isinstance(choices, list) and choices and isinstance(choices[0], dict) else {}
+            delta = choice.get("delta")
+            delta = delta.get("content") if isinstance(delta, dict) else None
+            if not delta or not isinstance(delta, str):
+                continue
+            
+            parts.append(delta)
+            if '}' in delta:
+                ai_data = _extract_json_object(''.join(parts))
+                if ai_data is not None and "insights" in ai_data and "recommendations" in ai_data:
+                    break
+        return ''.join(parts)
+    
+    async def _drain_response(self, response: aiohttp.ClientResponse):
+        """Read the rest of a response so its connection returns to the pool"""
+        async def read_to_eof() -> bool:
+            remaining = AI_STREAM_DRAIN_MAX_BYTES
+            async for chunk in response.content.iter_any():
+                remaining -= len(chunk)
+                if remaining < 0:
+                    logger.warning("ASI-1 stream tail exceeded drain limit, closing connection")
+                    return False
+            return True
+        
+        drained = False
+        try:
+            drained = await asyncio.wait_for(read_to_eof(), AI_STREAM_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("ASI-1 stream did not finish in time, closing connection")
+        except Exception as e:
+            logger.warning(f"Error draining ASI-1 response: {str(e)}")
+        finally:
+            if drained:
+                response.release()
+            else:
+                response.close()
+    
     def _get_fallback_insights(self) -> Tuple[List[str], List[str]]:
         """Fallback insights when AI is unavailable"""
         return [
@@ -191,179 +450,243 @@ class FetchAiVocalCoach:
             "Record yourself regularly to track your progress."
         ]
     
-    async def _get_daily_sessions(self, user_id: str, date: str) -> List[SessionMetrics]:
-        """Get all practice sessions for a specific day"""
-        if not self.supabase:
-            # Return mock data for demo
-            return [
-                SessionMetrics(
-                    timestamp=datetime.now(),
-                    mean_pitch=220.5,
-                    vibrato_rate=5.8,
-                    jitter=0.012,
-                    shimmer=0.017,
-                    dynamics="stable",
-                    voice_type="tenor",
-                    lowest_note="C3",
-                    highest_note="A4"
-                ),
-                SessionMetrics(
-                    timestamp=datetime.now() - timedelta(hours=2),
-                    mean_pitch=225.1,
-                    vibrato_rate=6.2,
-                    jitter=0.011,
-                    shimmer=0.016,
-                    dynamics="stable",
-                    voice_type="tenor",
-                    lowest_note="D3",
-                    highest_note="B4"
-                )
-            ]
-            
+    def _get_mock_sessions(self) -> SessionColumns:
+        """Mock sessions used when Supabase is not configured"""
+        now = datetime.now(timezone.utc)
+        return SessionColumns.from_rows([
+            {
+                "created_at": now.isoformat(),
+                "mean_pitch": 220.5,
+                "vibrato_rate": 5.8,
+                "jitter": 0.012,
+                "shimmer": 0.017,
+                "dynamics": "stable",
+                "voice_type": "tenor",
+                "lowest_note": "C3",
+                "highest_note": "A4"
+            },
+            {
+                "created_at": (now - timedelta(hours=2)).isoformat(),
+                "mean_pitch": 225.1,
+                "vibrato_rate": 6.2,
+                "jitter": 0.011,
+                "shimmer": 0.016,
+                "dynamics": "stable",
+                "voice_type": "tenor",
+                "lowest_note": "D3",
+                "highest_note": "B4"
+            }
+        ])
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the daily metrics cache"""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._metrics_cache)
+        }
+    
+    def _get_cached_metrics(self, keys: List[Tuple[str, str]]) -> Optional[Dict[str, DailyMetrics]]:
+        """Return cached metrics for every key, or None if any day is missing or stale"""
+        now = time.monotonic()
+        metrics_by_day = {}
+        for key in keys:
+            entry = self._metrics_cache.get(key)
+            if entry is None or entry[0] <= now:
+                return None
+            if entry[1]:
+                metrics_by_day[key[1]] = entry[1]
+        return metrics_by_day
+    
+    def _store_cached_metrics(self, keys: List[Tuple[str, str]], metrics_by_day: Dict[str, DailyMetrics]):
+        """Cache metrics per day, including days without any sessions"""
+        now = time.monotonic()
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        for key in keys:
+            ttl = math.inf if key[1] < today else TODAY_METRICS_CACHE_TTL
+            self._metrics_cache.pop(key, None)
+            self._metrics_cache[key] = (now + ttl, metrics_by_day.get(key[1]))
+        
+        # Evict the oldest entries once the cache grows past its limit
+        while len(self._metrics_cache) > METRICS_CACHE_MAX_ENTRIES:
+            del self._metrics_cache[next(iter(self._metrics_cache))]
+    
+    async def _get_daily_metrics_range(self, user_id: str, start_date: str, end_date: str) -> Dict[str, DailyMetrics]:
+        """Get aggregated metrics for every day between two days (inclusive) that has sessions"""
+        keys = [(user_id, day) for day in _iter_days(start_date, end_date)]
+        
+        cached = self._get_cached_metrics(keys)
+        if cached is not None:
+            self._cache_hits += 1
+            return cached
+        
+        # Lock each day in order so concurrent callers wait for a single fetch
+        locks = [self._metrics_locks.setdefault(key, asyncio.Lock()) for key in keys]
         try:
-            # Query for all sessions in the given day
-            start_date = f"{date}T00:00:00"
-            end_date = f"{date}T23:59:59"
-            
-            response = self.supabase.table('vocal_analysis_history').select('*').eq(
-                'user_id', user_id
-            ).gte('created_at', start_date).lte('created_at', end_date).execute()
-            
-            if not response.data:
-                return []
+            async with AsyncExitStack() as stack:
+                for lock in locks:
+                    await stack.enter_async_context(lock)
                 
-            return [
-                SessionMetrics(
-                    timestamp=datetime.fromisoformat(session['created_at'].replace('Z', '+00:00')),
-                    mean_pitch=session.get('mean_pitch', 0),
-                    vibrato_rate=session.get('vibrato_rate', 0),
-                    jitter=session.get('jitter', 0),
-                    shimmer=session.get('shimmer', 0),
-                    dynamics=session.get('dynamics', 'stable'),
-                    voice_type=session.get('voice_type', 'unknown'),
-                    lowest_note=session.get('lowest_note', 'C3'),
-                    highest_note=session.get('highest_note', 'C5')
-                )
-                for session in response.data
-            ]
-        except Exception as e:
-            logger.error(f"Error fetching daily sessions: {str(e)}")
-            return []
-
-    def _aggregate_daily_metrics(self, sessions: List[SessionMetrics]) -> Optional[DailyMetrics]:
+                cached = self._get_cached_metrics(keys)
+                if cached is not None:
+                    self._cache_hits += 1
+                    return cached
+                
+                self._cache_misses += 1
+                try:
+                    metrics_by_day = await self._fetch_daily_metrics_range(user_id, start_date, end_date)
+                except Exception as e:
+                    logger.error(f"Error fetching daily metrics: {str(e)}")
+                    return {}
+                
+                self._store_cached_metrics(keys, metrics_by_day)
+                return metrics_by_day
+        finally:
+            for key, lock in zip(keys, locks):
+                if not lock.locked() and self._metrics_locks.get(key) is lock:
+                    del self._metrics_locks[key]
+    
+    async def _fetch_daily_metrics_range(self, user_id: str, start_date: str, end_date: str) -> Dict[str, DailyMetrics]:
+        """Aggregate daily metrics in Postgres, falling back to aggregating raw sessions"""
+        if self.supabase and self._use_metrics_rpc:
+            try:
+                query = self.supabase.rpc('daily_vocal_metrics', {
+                    'p_user_id': user_id,
+                    'p_from': f"{start_date}T00:00:00",
+                    'p_to': f"{end_date}T23:59:59"
+                })
+                response = await asyncio.to_thread(query.execute)
+                return {
+                    row['date']: DailyMetrics(
+                        date=row['date'],
+                        session_count=row['session_count'],
+                        mean_pitch_avg=row['mean_pitch_avg'],
+                        vibrato_rate_avg=row['vibrato_rate_avg'],
+                        jitter_avg=row['jitter_avg'],
+                        shimmer_avg=row['shimmer_avg'],
+                        dynamics_mode=row['dynamics_mode'],
+                        voice_type_mode=row['voice_type_mode'],
+                        lowest_note=row['lowest_note'],
+                        highest_note=row['highest_note'],
+                        pitch_stability=row['pitch_stability'],
+                        practice_consistency=row['practice_consistency']
+                    )
+                    for row in response.data or []
+                }
+            except Exception as e:
+                if getattr(e, 'code', None) == 'PGRST202':
+                    # Function not deployed; stop trying it on every report
+                    self._use_metrics_rpc = False
+                logger.warning(f"daily_vocal_metrics RPC failed, aggregating sessions locally: {str(e)}")
+        
+        sessions_by_day = await self._fetch_sessions_range(user_id, start_date, end_date)
+        return {
+            day: self._aggregate_daily_metrics(day, sessions)
+            for day, sessions in sessions_by_day.items()
+        }
+    
+    async def _fetch_sessions_range(self, user_id: str, start_date: str, end_date: str) -> Dict[str, SessionColumns]:
+        """Query Supabase for all sessions between two days (inclusive), grouped by day"""
+        if not self.supabase:
+            # Return mock data for demo
+            return {day: self._get_mock_sessions() for day in _iter_days(start_date, end_date)}
+        
+        # Query all sessions in the range with a single round-trip
+        query = self.supabase.table('vocal_analysis_history').select(_SESSION_COLUMNS).eq(
+            'user_id', user_id
+        ).gte('created_at', f"{start_date}T00:00:00").lte(
+            'created_at', f"{end_date}T23:59:59"
+        ).order('created_at')
+        
+        # supabase 2.0 only exposes a sync client, so keep the HTTP call off the event loop
+        response = await asyncio.to_thread(query.execute)
+        
+        if not response.data:
+            return {}
+        
+        # Rows are ordered by created_at, so each day forms one contiguous group
+        return {
+            day: SessionColumns.from_rows(list(day_sessions))
+            for day, day_sessions in groupby(response.data, key=lambda session: session['created_at'][:10])
+        }
+    
+    def _aggregate_daily_metrics(self, date: str, sessions: Optional[SessionColumns]) -> Optional[DailyMetrics]:
         """Aggregate metrics from multiple sessions into daily metrics"""
         if not sessions:
             return None
-            
-        # Basic aggregations
-        mean_pitches = [s.mean_pitch for s in sessions]
-        vibrato_rates = [s.vibrato_rate for s in sessions]
-        jitters = [s.jitter for s in sessions]
-        shimmers = [s.shimmer for s in sessions]
+        
+        count = len(sessions)
         
         # Get mode for categorical data
-        dynamics = max(set(s.dynamics for s in sessions), 
-                      key=lambda x: sum(1 for s in sessions if s.dynamics == x))
-        voice_type = max(set(s.voice_type for s in sessions), 
-                        key=lambda x: sum(1 for s in sessions if s.voice_type == x))
+        values, counts = np.unique(sessions.dynamics, return_counts=True)
+        dynamics = str(values[counts.argmax()])
+        values, counts = np.unique(sessions.voice_type, return_counts=True)
+        voice_type = str(values[counts.argmax()])
         
         # Find vocal range
-        lowest_note = min(sessions, key=lambda x: self._note_to_frequency(x.lowest_note)).lowest_note
-        highest_note = max(sessions, key=lambda x: self._note_to_frequency(x.highest_note)).highest_note
+        lowest_freqs = _notes_to_frequencies(sessions.lowest)
+        highest_freqs = _notes_to_frequencies(sessions.highest)
+        lowest_note = str(sessions.lowest[lowest_freqs.argmin()])
+        highest_note = str(sessions.highest[highest_freqs.argmax()])
         
         # Calculate practice consistency (time spread)
-        timestamps = [s.timestamp for s in sessions]
-        time_spread = (max(timestamps) - min(timestamps)).total_seconds() / 3600  # in hours
+        time_spread = float(np.ptp(sessions.timestamps)) / 3600  # in hours
         
         return DailyMetrics(
-            date=sessions[0].timestamp.strftime("%Y-%m-%d"),
-            session_count=len(sessions),
-            mean_pitch_avg=statistics.mean(mean_pitches),
-            vibrato_rate_avg=statistics.mean(vibrato_rates),
-            jitter_avg=statistics.mean(jitters),
-            shimmer_avg=statistics.mean(shimmers),
+            date=date,
+            session_count=count,
+            mean_pitch_avg=float(sessions.pitch.mean()),
+            vibrato_rate_avg=float(sessions.vibrato.mean()),
+            jitter_avg=float(sessions.jitter.mean()),
+            shimmer_avg=float(sessions.shimmer.mean()),
             dynamics_mode=dynamics,
             voice_type_mode=voice_type,
             lowest_note=lowest_note,
             highest_note=highest_note,
-            pitch_stability=statistics.stdev(mean_pitches) if len(mean_pitches) > 1 else 0,
+            pitch_stability=float(sessions.pitch.std(ddof=1)) if count > 1 else 0,
             practice_consistency=time_spread
         )
 
-    def _calculate_improvement(self, current: float, previous: float) -> Tuple[float, str]:
-        """Calculate improvement percentage and trend"""
-        if previous == 0:
-            return (0, TrendDirection.STABLE.value)
-            
-        change_pct = ((current - previous) / previous) * 100
-        if abs(change_pct) < 1:
-            return (change_pct, TrendDirection.STABLE.value)
-        return (change_pct, TrendDirection.UP.value if change_pct > 0 else TrendDirection.DOWN.value)
+    def _make_comparison(self, current: float, previous: float) -> MetricComparison:
+        """Compare a metric against the previous day's value"""
+        improvement_percentage, trend = _calculate_improvement(current, previous)
+        return MetricComparison(
+            current=current,
+            previous=previous,
+            change=current - previous,
+            trend=trend,
+            improvement_percentage=improvement_percentage
+        )
 
     async def generate_daily_report(self, user_id: str, date: str) -> FetchAiReport:
         """Generate comprehensive daily vocal analysis report"""
-        try:
-            # Get sessions for the day
-            sessions = await self._get_daily_sessions(user_id, date)
+        # Concurrent requests for the same report share a single in-flight generation
+        key = (user_id, date)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate_daily_report(user_id, date))
+            self._inflight[key] = task
             
-            if not sessions:
-                return self._generate_fallback_report(user_id, date)
+            # Forget the task once finished so results and errors are never reused
+            def forget(done: asyncio.Future):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            task.add_done_callback(forget)
+        
+        # Shield so one caller being cancelled doesn't cancel the others' report
+        return await asyncio.shield(task)
+
+    async def _generate_daily_report(self, user_id: str, date: str) -> FetchAiReport:
+        """Build the daily report from aggregated metrics and AI insights"""
+        try:
+            # Get metrics for the day and the previous day in one query
+            previous_date = (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+            metrics_by_day = await self._get_daily_metrics_range(user_id, previous_date, date)
             
-            # Aggregate daily metrics
-            daily_metrics = self._aggregate_daily_metrics(sessions)
+            daily_metrics = metrics_by_day.get(date)
             if not daily_metrics:
                 return self._generate_fallback_report(user_id, date)
             
-            # Get previous day's metrics for comparison
-            previous_date = (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
-            previous_sessions = await self._get_daily_sessions(user_id, previous_date)
-            previous_metrics = self._aggregate_daily_metrics(previous_sessions) if previous_sessions else None
-            
-            # Calculate metrics with comparisons
-            metrics = {}
-            
-            # Vocal metrics
-            metrics["mean_pitch"] = MetricComparison(
-                current=daily_metrics.mean_pitch_avg,
-                previous=previous_metrics.mean_pitch_avg if previous_metrics else None,
-                change=daily_metrics.mean_pitch_avg - (previous_metrics.mean_pitch_avg if previous_metrics else daily_metrics.mean_pitch_avg),
-                trend=self._calculate_improvement(daily_metrics.mean_pitch_avg, previous_metrics.mean_pitch_avg if previous_metrics else daily_metrics.mean_pitch_avg)[1],
-                improvement_percentage=self._calculate_improvement(daily_metrics.mean_pitch_avg, previous_metrics.mean_pitch_avg if previous_metrics else daily_metrics.mean_pitch_avg)[0]
-            )
-            
-            metrics["vibrato_rate"] = MetricComparison(
-                current=daily_metrics.vibrato_rate_avg,
-                previous=previous_metrics.vibrato_rate_avg if previous_metrics else None,
-                change=daily_metrics.vibrato_rate_avg - (previous_metrics.vibrato_rate_avg if previous_metrics else daily_metrics.vibrato_rate_avg),
-                trend=self._calculate_improvement(daily_metrics.vibrato_rate_avg, previous_metrics.vibrato_rate_avg if previous_metrics else daily_metrics.vibrato_rate_avg)[1],
-                improvement_percentage=self._calculate_improvement(daily_metrics.vibrato_rate_avg, previous_metrics.vibrato_rate_avg if previous_metrics else daily_metrics.vibrato_rate_avg)[0]
-            )
-            
-            metrics["jitter"] = MetricComparison(
-                current=daily_metrics.jitter_avg,
-                previous=previous_metrics.jitter_avg if previous_metrics else None,
-                change=daily_metrics.jitter_avg - (previous_metrics.jitter_avg if previous_metrics else daily_metrics.jitter_avg),
-                trend=self._calculate_improvement(daily_metrics.jitter_avg, previous_metrics.jitter_avg if previous_metrics else daily_metrics.jitter_avg)[1],
-                improvement_percentage=self._calculate_improvement(daily_metrics.jitter_avg, previous_metrics.jitter_avg if previous_metrics else daily_metrics.jitter_avg)[0]
-            )
-            
-            metrics["shimmer"] = MetricComparison(
-                current=daily_metrics.shimmer_avg,
-                previous=previous_metrics.shimmer_avg if previous_metrics else None,
-                change=daily_metrics.shimmer_avg - (previous_metrics.shimmer_avg if previous_metrics else daily_metrics.shimmer_avg),
-                trend=self._calculate_improvement(daily_metrics.shimmer_avg, previous_metrics.shimmer_avg if previous_metrics else daily_metrics.shimmer_avg)[1],
-                improvement_percentage=self._calculate_improvement(daily_metrics.shimmer_avg, previous_metrics.shimmer_avg if previous_metrics else daily_metrics.shimmer_avg)[0]
-            )
-            
-            # Practice metrics
-            metrics["total_sessions"] = MetricComparison(
-                current=daily_metrics.session_count,
-                previous=previous_metrics.session_count if previous_metrics else None,
-                change=daily_metrics.session_count - (previous_metrics.session_count if previous_metrics else 0),
-                trend=self._calculate_improvement(daily_metrics.session_count, previous_metrics.session_count if previous_metrics else 0)[1],
-                improvement_percentage=self._calculate_improvement(daily_metrics.session_count, previous_metrics.session_count if previous_metrics else 0)[0]
-            )
-            
             # Prepare data for AI analysis
             metrics_data = f"""
             Date: {date}
@@ -380,8 +703,45 @@ class FetchAiVocalCoach:
             
             user_context = f"User {user_id} practicing vocal techniques with {daily_metrics.session_count} sessions on {date}"
             
-            # Get AI-powered insights
-            insights, recommendations = await self._get_ai_insights(metrics_data, user_context)
+            # Start AI-powered insights while the comparisons are computed
+            ai_task = asyncio.create_task(self._get_ai_insights(metrics_data, user_context))
+            
+            # Get previous day's metrics for comparison
+            previous_metrics = metrics_by_day.get(previous_date)
+            
+            # Calculate metrics with comparisons
+            current_values = {
+                "mean_pitch": daily_metrics.mean_pitch_avg,
+                "vibrato_rate": daily_metrics.vibrato_rate_avg,
+                "jitter": daily_metrics.jitter_avg,
+                "shimmer": daily_metrics.shimmer_avg,
+                "total_sessions": daily_metrics.session_count
+            }
+            
+            if previous_metrics is None:
+                # First recorded day: every metric is its own baseline
+                metrics = {
+                    key: MetricComparison(
+                        current=value,
+                        previous=None,
+                        change=0.0,
+                        trend=TrendDirection.STABLE.value,
+                        improvement_percentage=0.0
+                    )
+                    for key, value in current_values.items()
+                }
+            else:
+                previous_values = {
+                    "mean_pitch": previous_metrics.mean_pitch_avg,
+                    "vibrato_rate": previous_metrics.vibrato_rate_avg,
+                    "jitter": previous_metrics.jitter_avg,
+                    "shimmer": previous_metrics.shimmer_avg,
+                    "total_sessions": previous_metrics.session_count
+                }
+                metrics = {
+                    key: self._make_comparison(value, previous_values[key])
+                    for key, value in current_values.items()
+                }
             
             # Generate summary
             summary = self._generate_summary(daily_metrics, previous_metrics)
@@ -392,6 +752,8 @@ class FetchAiVocalCoach:
             # Determine best time of day (mock for now)
             best_time_of_day = "Morning (9-11 AM)"
             
+            insights, recommendations = await ai_task
+            
             return FetchAiReport(
                 date=date,
                 id=f"report_{user_id}_{date}",
@@ -410,37 +772,13 @@ class FetchAiVocalCoach:
 
     def _calculate_note_range(self, lowest: str, highest: str) -> float:
         """Calculate the range between two notes in semitones"""
-        lowest_freq = self._note_to_frequency(lowest)
-        highest_freq = self._note_to_frequency(highest)
+        lowest_freq = _note_to_frequency(lowest)
+        highest_freq = _note_to_frequency(highest)
         return 12 * (highest_freq / lowest_freq) if lowest_freq > 0 else 0
 
-    def _note_to_frequency(self, note: str) -> float:
-        """Convert note name to frequency"""
-        note_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        if len(note) < 2:
-            return 0
-        
-        note_name = note[:-1]
-        octave = int(note[-1])
-        
-        if note_name not in note_names:
-            return 0
-        
-        note_index = note_names.index(note_name)
-        # A4 = 440 Hz
-        return 440 * (2 ** ((note_index - 9) / 12 + (octave - 4)))
-
     def _generate_summary(self, current: DailyMetrics, previous: Optional[DailyMetrics]) -> str:
         """Generate a summary of the daily performance"""
-        if previous:
-            if current.session_count > previous.session_count:
-                return f"Excellent progress today! You completed {current.session_count} practice sessions, showing increased dedication to your vocal development."
-            elif current.session_count == previous.session_count:
-                return f"Consistent practice maintained with {current.session_count} sessions today. Your vocal technique continues to develop steadily."
-            else:
-                return f"Completed {current.session_count} practice sessions today. Consider increasing practice frequency for optimal progress."
-        else:
-            return f"Great start! You completed {current.session_count} practice sessions today. Keep up the momentum!"
+        return _summary(current.session_count, previous.session_count if previous else None)
 
     def _generate_fallback_report(self, user_id: str, date: str) -> FetchAiReport:
         """Generate a fallback report when no data is available"""
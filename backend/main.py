@@ -58,6 +58,12 @@ async def start_fetch_ai_agent():
     except Exception as e:
         logger.error(f"Failed to start Fetch AI agent: {str(e)}")
 
+@app.on_event("shutdown")
+async def close_fetch_ai_clients():
+    """Close shared HTTP sessions used by the Fetch AI service"""
+    await fetch_ai_coach.close()
+    await vocal_agent.fetch_ai_coach.close()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -0,0 +1,83 @@
+/*
+  # Server-side daily vocal metrics aggregation
+
+  1. New Tables
+    - `note_freq` - Lookup of note names (C0..B9) to frequencies in Hz (A4 = 440 Hz)
+
+  2. New Functions
+    - `daily_vocal_metrics(p_user_id, p_from, p_to)` - Aggregates a user's
+      vocal_analysis_history rows per UTC day: averages, pitch stability,
+      dynamics/voice type modes, vocal range and practice time spread
+
+  3. Security
+    - Note frequencies are readable by everyone
+    - Function runs with the caller's privileges (RLS still applies)
+*/
+
+-- Note name -> frequency lookup used to order notes by pitch
+CREATE TABLE IF NOT EXISTS note_freq (
+  note text PRIMARY KEY,
+  freq double precision NOT NULL
+);
+
+INSERT INTO note_freq (note, freq)
+SELECT
+  n.name || o.octave,
+  440 * power(2, (n.idx - 10) / 12.0 + (o.octave - 4))
+FROM unnest(ARRAY['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B'])
+  WITH ORDINALITY AS n(name, idx)
+CROSS JOIN generate_series(0, 9) AS o(octave)
+ON CONFLICT (note) DO NOTHING;
+
+ALTER TABLE note_freq ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Note frequencies are viewable by everyone" ON note_freq;
+CREATE POLICY "Note frequencies are viewable by everyone"
+  ON note_freq FOR SELECT
+  USING (true);
+
+-- Aggregate a user's sessions per day (matches FetchAiVocalCoach._aggregate_daily_metrics)
+CREATE OR REPLACE FUNCTION public.daily_vocal_metrics(
+  p_user_id uuid,
+  p_from timestamptz,
+  p_to timestamptz
+)
+RETURNS TABLE (
+  date date,
+  session_count integer,
+  mean_pitch_avg double precision,
+  pitch_stability double precision,
+  vibrato_rate_avg double precision,
+  jitter_avg double precision,
+  shimmer_avg double precision,
+  dynamics_mode text,
+  voice_type_mode text,
+  lowest_note text,
+  highest_note text,
+  practice_consistency double precision
+) AS $$
+  SELECT
+    (h.created_at AT TIME ZONE 'UTC')::date,
+    count(*)::integer,
+    avg(COALESCE(h.mean_pitch, 0))::double precision,
+    COALESCE(stddev_samp(COALESCE(h.mean_pitch, 0)), 0)::double precision,
+    avg(COALESCE(h.vibrato_rate, 0))::double precision,
+    avg(COALESCE(h.jitter, 0))::double precision,
+    avg(COALESCE(h.shimmer, 0))::double precision,
+    mode() WITHIN GROUP (ORDER BY COALESCE(h.dynamics::text, 'stable')),
+    mode() WITHIN GROUP (ORDER BY COALESCE(h.voice_type::text, 'unknown')),
+    (array_agg(COALESCE(h.lowest_note::text, 'C3') ORDER BY COALESCE(lo.freq, 0) ASC))[1],
+    (array_agg(COALESCE(h.highest_note::text, 'C5') ORDER BY COALESCE(hi.freq, 0) DESC))[1],
+    (extract(epoch FROM max(h.created_at) - min(h.created_at)) / 3600)::double precision
+  FROM vocal_analysis_history h
+  LEFT JOIN note_freq lo ON lo.note = COALESCE(h.lowest_note::text, 'C3')
+  LEFT JOIN note_freq hi ON hi.note = COALESCE(h.highest_note::text, 'C5')
+  WHERE h.user_id = p_user_id
+    AND h.created_at >= p_from
+    AND h.created_at <= p_to
+  GROUP BY 1
+  ORDER BY 1;
+$$ LANGUAGE sql STABLE;
+
+-- Grant permissions
+GRANT EXECUTE ON FUNCTION public.daily_vocal_metrics(uuid, timestamptz, timestamptz) TO authenticated, service_role;
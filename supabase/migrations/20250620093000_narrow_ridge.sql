@@ -0,0 +1,15 @@
+/*
+  # Covering index for per-user vocal analysis history lookups
+
+  1. New Indexes
+    - `idx_vocal_analysis_history_user_created` on vocal_analysis_history (user_id, created_at)
+      including the metric columns read by the Fetch AI report service, so its
+      date-range queries and `daily_vocal_metrics` can be answered from the index
+
+  2. Security
+    - Maintain existing RLS policies
+*/
+
+CREATE INDEX IF NOT EXISTS idx_vocal_analysis_history_user_created
+  ON vocal_analysis_history (user_id, created_at)
+  INCLUDE (mean_pitch, vibrato_rate, jitter, shimmer, dynamics, voice_type, lowest_note, highest_note);